@@ -1,7 +1,9 @@
-import sys, os, shutil, subprocess, tempfile, hashlib
+import sys, os, shutil, subprocess, tempfile, hashlib, json, threading, time
+from collections import deque
+from functools import lru_cache
 from pathlib import Path
 
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal, QTimer
 from PyQt5.QtGui import QPixmap, QIcon
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QPushButton, QLabel, QFileDialog,
@@ -10,6 +12,17 @@ from PyQt5.QtWidgets import (
 
 APP_TITLE = "Video Color Converter (Preview Fixed)"
 
+# outputs are only ever complete (written as .part, renamed on success),
+# so an existing one can be trusted when re-running a batch
+SKIP_EXISTING = False
+
+# libx264 is CPU-bound: run a few encoders side by side instead of one per file
+THREADS_PER_ENCODE = 2
+MAX_CONCURRENT = max(1, (os.cpu_count() or 2) // THREADS_PER_ENCODE)
+# hardware encoders share one media engine (and NVENC caps sessions on
+# consumer cards), so more parallel jobs only add failures
+HW_MAX_CONCURRENT = 2
+
 # ---------- Utilities ----------
 def find_tool(name_win):
     """
@@ -35,6 +48,10 @@ def find_tool(name_win):
 
     return name_win  # let it fail with clear message
 
+# resolved once: PATH lookups are slow on Windows and don't change mid-session
+FFMPEG = find_tool("ffmpeg.exe")
+FFPROBE = find_tool("ffprobe.exe")
+
 def windows_startupinfo():
     # Hide console window of ffmpeg on Windows
     if os.name == "nt":
@@ -43,120 +60,443 @@ def windows_startupinfo():
         return si
     return None
 
+HW_ENCODERS = ["h264_videotoolbox", "h264_nvenc", "h264_qsv", "h264_amf"]
+_detect_lock = threading.Lock()
+
+def detect_hw_encoder(ffmpeg):
+    """
+    Thread-safe: concurrent first callers wait for a single detection run
+    instead of each test-encoding on the GPU.
+    """
+    with _detect_lock:
+        return _detect_hw_encoder(ffmpeg)
+
+@lru_cache(maxsize=None)
+def _detect_hw_encoder(ffmpeg):
+    """
+    First H.264 hardware encoder that actually works here, else libx264.
+    Builds often list nvenc/qsv/amf without the GPU being present, so each
+    candidate gets a one-frame test encode. Runs once per session.
+    """
+    try:
+        p = subprocess.run(
+            [ffmpeg, "-hide_banner", "-encoders"],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+            timeout=10, startupinfo=windows_startupinfo()
+        )
+        listed = p.stdout
+        for enc in HW_ENCODERS:
+            if enc not in listed:
+                continue
+            t = subprocess.run(
+                [ffmpeg, "-hide_banner", "-loglevel", "error",
+                 "-f", "lavfi", "-i", "color=black:s=256x256:d=0.1",
+                 "-frames:v", "1", "-c:v", enc, "-f", "null", "-"],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                timeout=10, startupinfo=windows_startupinfo()
+            )
+            if t.returncode == 0:
+                return enc
+    except Exception:
+        pass
+    return "libx264"
+
+def encoder_args(encoder, bitrate):
+    if encoder == "h264_videotoolbox":
+        return ["-c:v", encoder, "-b:v", bitrate, "-allow_sw", "1"]
+    if encoder == "h264_nvenc":
+        return ["-c:v", encoder, "-preset", "p4", "-rc", "vbr", "-b:v", bitrate]
+    return ["-c:v", encoder, "-b:v", bitrate]
+
+def _file_key(path):
+    # identifies one version of a file: edits change mtime and/or size
+    st = os.stat(path)
+    return (os.path.abspath(path), st.st_mtime, st.st_size)
+
+# (path, mtime, size) -> bitrate string or None
+_measured_cache = {}
+
+def measured_bitrate(ffprobe, path, packets=500):
+    """
+    Video bitrate (bits/s, as a string) averaged over the first `packets`
+    packets, for containers that don't declare one. None if unmeasurable.
+    Only the encode needs it, so it's kept out of probe(); cached the same way.
+    """
+    key = _file_key(path)
+    if key in _measured_cache:
+        return _measured_cache[key]
+
+    p = subprocess.run(
+        [ffprobe, "-v", "error", "-select_streams", "v:0",
+         "-read_intervals", f"%+#{packets}",
+         "-show_entries", "packet=size,duration_time",
+         "-of", "default=noprint_wrappers=1", path],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+        startupinfo=windows_startupinfo()
+    )
+    size = seconds = 0.0
+    for line in p.stdout.splitlines():
+        k, _, v = line.partition("=")
+        try:
+            if k == "size":
+                size += int(v)
+            elif k == "duration_time":
+                seconds += float(v)
+        except ValueError:
+            pass  # N/A
+    result = str(int(size * 8 / seconds)) if size > 0 and seconds > 0 else None
+    if p.returncode == 0:
+        _measured_cache[key] = result
+    return result
+
+# (path, mtime, size) -> (duration seconds, bitrate string or None)
+_probe_cache = {}
+
+def probe(path):
+    """
+    Duration + video bitrate of `path` from a single ffprobe call.
+    Cached per file version, so repeated previews/conversions skip ffprobe.
+    """
+    key = _file_key(path)
+    hit = _probe_cache.get(key)
+    if hit is not None:
+        return hit
+
+    p = subprocess.run(
+        [FFPROBE, "-v", "error", "-select_streams", "v:0",
+         "-show_entries", "format=duration:stream=bit_rate",
+         "-of", "json", path],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+        startupinfo=windows_startupinfo()
+    )
+    try:
+        data = json.loads(p.stdout or "{}")
+    except ValueError:
+        data = {}
+    try:
+        duration = float(data.get("format", {}).get("duration", ""))
+    except ValueError:
+        duration = 0.0
+    streams = data.get("streams") or [{}]
+    bitrate = str(streams[0].get("bit_rate", ""))
+    if not bitrate.isdigit():
+        bitrate = None  # not declared; the encode measures it if it needs it
+
+    result = (duration, bitrate)
+    if p.returncode == 0:
+        _probe_cache[key] = result
+    return result
+
+# ffmpeg progress as key=value lines on stdout, only errors on stderr
+PROGRESS_ARGS = ["-progress", "pipe:1", "-nostats", "-loglevel", "error"]
+
 # ---------- Worker: one file convert ----------
-class FFmpegWorker(QThread):
+class _Signals(QObject):
+    # QRunnable is not a QObject, so the signals live on a small helper
     progress = pyqtSignal(int)       # 0..100
     done = pyqtSignal(str)           # output path
     error = pyqtSignal(str)          # message
 
-    def __init__(self, input_path, output_path, saturation):
+class FFmpegWorker(QRunnable):
+    def __init__(self, input_path, output_path, saturation,
+                 threads=THREADS_PER_ENCODE, encoder=None):
         super().__init__()
+        self.signals = _Signals()
         self.input_path = input_path
         self.output_path = output_path
         self.saturation = saturation
+        self.threads = threads       # this job's share of the CPU
+        self.encoder = encoder       # None: startup detection not finished yet
+        self._last_emit = 0.0
+        self._cancel = False
+        self._proc = None
+
+    def cancel(self):
+        """
+        Called from the UI thread when the window closes mid-batch.
+        """
+        self._cancel = True
+        proc = self._proc
+        if proc is not None and proc.poll() is None:
+            proc.terminate()
 
     def run(self):
-        try:
-            ffmpeg = find_tool("ffmpeg.exe")
-            ffprobe = find_tool("ffprobe.exe")
-
-            # --- bitrate (original) ---
-            p = subprocess.run(
-                [ffprobe, "-v", "error", "-select_streams", "v:0",
-                 "-show_entries", "stream=bit_rate",
-                 "-of", "default=nokey=1:noprint_wrappers=1", self.input_path],
-                stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
-                startupinfo=windows_startupinfo()
-            )
-            bitrate = p.stdout.strip() or "12M"
+        if self._cancel:
+            return
+        if SKIP_EXISTING and os.path.exists(self.output_path):
+            self.signals.progress.emit(100)
+            self.signals.done.emit(self.output_path)
+            return
 
-            # --- duration ---
-            d = subprocess.run(
-                [ffprobe, "-v", "error", "-show_entries", "format=duration",
-                 "-of", "default=nokey=1:noprint_wrappers=1", self.input_path],
-                stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
-                startupinfo=windows_startupinfo()
-            )
-            try:
-                duration = float(d.stdout.strip())
-            except Exception:
-                duration = 0.0
+        # ffmpeg writes here; renamed over output_path only once it succeeded
+        tmp = self.output_path + ".part"
+        try:
+            # --- duration + bitrate (original; usually cached at add time) ---
+            duration, bitrate = probe(self.input_path)
+
+            # --- saturation 100%: nothing to filter, just remux ---
+            if abs(self.saturation - 1.0) < 1e-6:
+                cmd = [
+                    FFMPEG, "-y", "-fflags", "+genpts", "-i", self.input_path,
+                    "-c", "copy", "-movflags", "+faststart",
+                    *PROGRESS_ARGS,
+                    "-f", "mp4", tmp
+                ]
+                returncode = self._run_ffmpeg(cmd, duration)[0]
+                if self._cancel:
+                    return
+                if returncode == 0:
+                    os.replace(tmp, self.output_path)
+                    self.signals.progress.emit(100)
+                    self.signals.done.emit(self.output_path)
+                    return
+                # e.g. codecs that mp4 can't hold: fall back to a normal encode
+                self._last_emit = 0.0
+
+            # --- bitrate not declared by the container: sample packets ---
+            if bitrate is None:
+                bitrate = measured_bitrate(FFPROBE, self.input_path)
+            bitrate = bitrate or "12M"
 
             # --- filter ---
             vf = f"eq=saturation={self.saturation}"
             if self.saturation <= 0:
                 vf += ",format=yuv420p"
 
-            cmd = [
-                ffmpeg, "-y", "-i", self.input_path,
-                "-vf", vf,
-                "-b:v", bitrate, "-c:a", "copy",
-                self.output_path
-            ]
-
-            proc = subprocess.Popen(
-                cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
-                universal_newlines=True, startupinfo=windows_startupinfo()
-            )
-
-            import re
-            t_re = re.compile(r"time=(\d+):(\d+):(\d+\.\d+)")
-            last = -1
-            for line in proc.stderr:
-                m = t_re.search(line)
-                if m and duration > 0:
-                    h, mm, s = int(m.group(1)), int(m.group(2)), float(m.group(3))
-                    t = h*3600 + mm*60 + s
-                    pct = max(0, min(100, int((t/duration)*100)))
-                    if pct != last:
-                        last = pct
-                        self.progress.emit(pct)
-
-            proc.wait()
-            if proc.returncode == 0:
-                self.progress.emit(100)
-                self.done.emit(self.output_path)
+            encoder = self.encoder or detect_hw_encoder(FFMPEG)
+            returncode, err = self._encode(encoder, vf, bitrate, duration, tmp)
+            if returncode != 0 and encoder != "libx264" and not self._cancel:
+                # the hw encoder passed its startup test but can still reject
+                # a real input (size limits, busy sessions): retry in software
+                self._last_emit = 0.0
+                returncode, err = self._encode("libx264", vf, bitrate, duration, tmp)
+            if self._cancel:
+                return  # the window is gone; nobody to report to
+            if returncode == 0:
+                os.replace(tmp, self.output_path)
+                self.signals.progress.emit(100)
+                self.signals.done.emit(self.output_path)
             else:
-                self.error.emit("FFmpeg failed (exit code {})".format(proc.returncode))
+                msg = "FFmpeg failed (exit code {})".format(returncode)
+                err = err.decode("utf-8", "replace").strip()
+                if err:
+                    msg += ":\n" + err.splitlines()[-1]
+                self.signals.error.emit(msg)
 
         except Exception as e:
-            self.error.emit(str(e))
+            self.signals.error.emit(str(e))
+        finally:
+            try:
+                os.remove(tmp)  # leftover of a failed run
+            except OSError:
+                pass
+
+    def _encode(self, encoder, vf, bitrate, duration, tmp):
+        # the CPU split only applies to libx264; hw encoders run on the GPU
+        threads = []
+        if encoder == "libx264":
+            threads = ["-threads", str(self.threads),
+                       "-x264-params", f"threads={self.threads}"]
+
+        cmd = [
+            FFMPEG, "-y", "-i", self.input_path,
+            "-vf", vf,
+            *encoder_args(encoder, bitrate), "-c:a", "copy",
+            *threads,
+            *PROGRESS_ARGS,
+            "-f", "mp4", tmp
+        ]
+        return self._run_ffmpeg(cmd, duration)
+
+    def _run_ffmpeg(self, cmd, duration):
+        """
+        Run ffmpeg, emitting progress; returns (exit code, log bytes).
+        Pipes stay binary: only the failure message ever gets decoded.
+        """
+        # stderr is merged into the one pipe we read: a separate, unread
+        # stderr pipe fills up on noisy (damaged) inputs and stalls ffmpeg
+        proc = subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            startupinfo=windows_startupinfo()
+        )
+        self._proc = proc
+        if self._cancel:  # cancel() ran before _proc was set
+            proc.terminate()
+
+        # -progress writes key=value blocks; the rest are error log lines.
+        # Read the pipe in chunks rather than line by line.
+        fd = proc.stdout.fileno()
+        buf = b""
+        log = deque(maxlen=20)  # last few error lines for the message
+        last = -1
+        while True:
+            chunk = os.read(fd, 4096)
+            if not chunk:
+                break
+            buf += chunk
+            *lines, buf = buf.split(b"\n")
+            for line in lines:
+                if not line.startswith(b"out_time_ms="):
+                    # other -progress keys ("frame=12", "speed=  1x") are
+                    # skipped; anything else is an error log line
+                    key, sep, _ = line.partition(b"=")
+                    if sep and key.replace(b"_", b"").isalnum():
+                        continue
+                    line = line.strip()
+                    if line:
+                        log.append(line)
+                    continue
+                if duration <= 0:
+                    continue
+                try:
+                    t = int(line[12:]) / 1_000_000  # microseconds, despite the name
+                except ValueError:
+                    continue  # "N/A" before the first frame
+                pct = max(0, min(100, int((t/duration)*100)))
+                # at most ~10 cross-thread updates per second per worker
+                now = time.monotonic()
+                if pct != last and now - self._last_emit > 0.1:
+                    self._last_emit = now
+                    last = pct
+                    self.signals.progress.emit(pct)
+
+        if buf.strip():
+            log.append(buf.strip())
+        proc.wait()
+        return proc.returncode, b"\n".join(log)
+
+# ---------- Encoder detection (once, at startup) ----------
+class _EncoderSignals(QObject):
+    detected = pyqtSignal(str)  # encoder name
+
+class EncoderDetector(QRunnable):
+    def __init__(self):
+        super().__init__()
+        self.signals = _EncoderSignals()
+
+    def run(self):
+        self.signals.detected.emit(detect_hw_encoder(FFMPEG))
+
+# ---------- Probe added files in the background ----------
+class ProbeWorker(QRunnable):
+    """
+    Warms probe()'s cache so the encode later skips ffprobe. Results stay in
+    that cache, which re-probes edited files and retries failed probes.
+    """
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+
+    def run(self):
+        try:
+            probe(self.path)
+        except Exception:
+            pass  # the encode will probe (and report) again
 
 # ---------- Preview helper (debounced) ----------
-class Previewer(QThread):
+# our own folder, so pruning never touches other programs' temp files
+PREVIEW_DIR = Path(tempfile.gettempdir()) / "video_color_converter_previews"
+
+class _PreviewSignals(QObject):
     ready = pyqtSignal(str)  # jpg path or "" on failure
 
-    def __init__(self, video_path, saturation):
+class Previewer(QRunnable):
+    def __init__(self, video_path, saturation, target_w, target_h):
         super().__init__()
+        self.signals = _PreviewSignals()
         self.video_path = video_path
         self.saturation = saturation
+        self.target_w = max(1, target_w)   # ffmpeg scales the frame to fit
+        self.target_h = max(1, target_h)
+        self._cancel = False
+        self._proc = None
+
+    def cancel(self):
+        """
+        Called from the UI thread when a newer preview supersedes this one.
+        """
+        self._cancel = True
+        proc = self._proc
+        if proc is not None and proc.poll() is None:
+            proc.terminate()
 
     def run(self):
+        if self._cancel:
+            return
         try:
-            ffmpeg = find_tool("ffmpeg.exe")
-            # cache file name by (path + sat)
-            key = (Path(self.video_path).resolve().as_posix() + f"|{self.saturation:.3f}").encode("utf-8")
-            fname = "preview_" + hashlib.md5(key).hexdigest() + ".jpg"
-            outjpg = str(Path(tempfile.gettempdir()) / fname)
+            # cache file name by (path + file version + sat + size)
+            st = os.stat(self.video_path)
+            key = (Path(self.video_path).resolve().as_posix()
+                   + f"|{st.st_mtime_ns}|{st.st_size}|{self.saturation:.3f}"
+                   + f"|{self.target_w}x{self.target_h}").encode("utf-8")
+            fname = "preview_" + hashlib.blake2b(key, digest_size=16).hexdigest() + ".jpg"
+            PREVIEW_DIR.mkdir(exist_ok=True)
+            outjpg = str(PREVIEW_DIR / fname)
+
+            # already rendered: reuse it (and mark it recently used for pruning)
+            if os.path.exists(outjpg) and os.path.getsize(outjpg) > 500:
+                os.utime(outjpg)
+                self.signals.ready.emit(outjpg)
+                return
 
-            vf = f"eq=saturation={self.saturation}"
+            vf = (f"eq=saturation={self.saturation},"
+                  f"scale={self.target_w}:{self.target_h}:force_original_aspect_ratio=decrease")
             if self.saturation <= 0:
                 vf += ",format=yuv420p"
 
-            cmd = [ffmpeg, "-y", "-ss", "00:00:01", "-i", self.video_path,
-                   "-frames:v", "1", "-vf", vf, outjpg]
+            # 1s in, or the middle of clips too short for that
+            duration, _ = probe(self.video_path)
+            ss = duration / 2 if 0 < duration < 2 else 1.0
 
-            subprocess.run(
+            # rendered under a temp name so a cancelled ffmpeg never leaves
+            # a half-written JPEG behind as a cache hit
+            tmpjpg = outjpg[:-len(".jpg")] + ".tmp.jpg"
+
+            # video stream only: no audio/subtitle/data decoders to set up
+            cmd = [FFMPEG, "-y", "-loglevel", "error", "-timelimit", "3",
+                   "-ss", f"{ss:.3f}", "-i", self.video_path,
+                   "-map", "0:v:0", "-an", "-sn", "-dn",
+                   "-frames:v", "1", "-vf", vf, "-q:v", "5", tmpjpg]
+
+            proc = subprocess.Popen(
                 cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
-                timeout=4, startupinfo=windows_startupinfo()
+                startupinfo=windows_startupinfo()
             )
+            self._proc = proc
+            if self._cancel:  # cancel() ran before _proc was set
+                proc.terminate()
+            try:
+                proc.wait(timeout=4)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+
+            if self._cancel or proc.returncode != 0:
+                if os.path.exists(tmpjpg):
+                    os.remove(tmpjpg)
+                if self._cancel:
+                    return
+            else:
+                os.replace(tmpjpg, outjpg)
 
             if os.path.exists(outjpg) and os.path.getsize(outjpg) > 500:
-                self.ready.emit(outjpg)
+                self.signals.ready.emit(outjpg)
             else:
-                self.ready.emit("")
+                self.signals.ready.emit("")
         except Exception:
-            self.ready.emit("")
+            self.signals.ready.emit("")
+
+def prune_previews(keep=64):
+    """
+    Keep only the `keep` most recently used preview JPEGs in PREVIEW_DIR.
+    """
+    try:
+        files = sorted(PREVIEW_DIR.glob("preview_*.jpg"),
+                       key=lambda p: p.stat().st_mtime, reverse=True)
+        for old in files[keep:]:
+            old.unlink()
+    except OSError:
+        pass
 
 # ---------- Main App ----------
 class App(QWidget):
@@ -169,11 +509,26 @@ class App(QWidget):
         except Exception:
             pass
 
-        self.files = []
+        self.files = {}           # input paths in list order (dict as ordered set)
         self.output_dir = ""
-        self.workers = []         # keep references
-        self.queue = []           # files to process
-        self.current_worker = None
+        self.active = set()       # submitted workers (keeps references)
+        self.file_progress = {}   # input path -> 0..100
+        self.errors = []
+
+        # encodes (and add-time probes) run MAX_CONCURRENT wide (narrowed once
+        # a hw encoder is detected); previews get their own single thread so
+        # a batch never delays them
+        self.encode_pool = QThreadPool(self)
+        self.encode_pool.setMaxThreadCount(MAX_CONCURRENT)
+        self.preview_pool = QThreadPool(self)
+        self.preview_pool.setMaxThreadCount(1)
+
+        # find the H.264 encoder up front; workers get the result
+        self.encoder = None
+        detector = EncoderDetector()
+        detector.signals.detected.connect(self._on_encoder_detected)
+        self._detector = detector  # keep the signals alive until it reports
+        self.encode_pool.start(detector)
 
         # --- UI ---
         self.preview_label = QLabel("Preview")
@@ -234,7 +589,7 @@ class App(QWidget):
         self._debounce.setSingleShot(True)
         self._debounce.timeout.connect(self.update_preview_now)
 
-        self._preview_thread = None
+        self._preview_task = None
 
     # ----- Drag & Drop -----
     def dragEnterEvent(self, e):
@@ -245,9 +600,7 @@ class App(QWidget):
         added = False
         for u in e.mimeData().urls():
             f = u.toLocalFile()
-            if f.lower().endswith((".mp4",".mov",".mkv",".avi",".webm")) and f not in self.files:
-                self.files.append(f)
-                self.list.addItem(f)
+            if f.lower().endswith((".mp4",".mov",".mkv",".avi",".webm")) and self._add_file(f):
                 added = True
         if added:
             if self.list.currentRow() < 0:
@@ -261,18 +614,22 @@ class App(QWidget):
         if not files:
             return
         for f in files:
-            if f not in self.files:
-                self.files.append(f)
-                self.list.addItem(f)
+            self._add_file(f)
         if self.list.currentRow() < 0 and self.files:
             self.list.setCurrentRow(0)
         self.update_preview_debounced()
 
+    def _add_file(self, f):
+        if f in self.files:
+            return False
+        self.files[f] = None
+        self.list.addItem(f)
+        self.encode_pool.start(ProbeWorker(f))
+        return True
+
     def remove_selected(self):
         for item in self.list.selectedItems():
-            txt = item.text()
-            if txt in self.files:
-                self.files.remove(txt)
+            self.files.pop(item.text(), None)
             self.list.takeItem(self.list.row(item))
         self.update_preview_debounced()
 
@@ -297,83 +654,124 @@ class App(QWidget):
         video = current.text()
         sat = self.s_slider.value() / 100.0
 
-        # kill previous preview thread if still running
-        if self._preview_thread and self._preview_thread.isRunning():
-            self._preview_thread.terminate()
-            self._preview_thread.wait()
-
         self.preview_label.setText("Generating preview…")
         self.preview_label.setPixmap(QPixmap())
 
-        self._preview_thread = Previewer(video, sat)
-        self._preview_thread.ready.connect(self._on_preview_ready)
-        self._preview_thread.start()
+        # stop the previous preview's ffmpeg; never block the UI waiting on it
+        if self._preview_task is not None:
+            self._preview_task.cancel()
 
-    def _on_preview_ready(self, jpg_path):
+        # render at device pixels so scaled (HiDPI) displays stay sharp
+        dpr = self.preview_label.devicePixelRatioF()
+        task = Previewer(video, sat, round(self.preview_label.width() * dpr),
+                         round(self.preview_label.height() * dpr))
+        task.signals.ready.connect(lambda jpg, t=task: self._on_preview_ready(t, jpg))
+        self._preview_task = task
+        self.preview_pool.start(task)
+
+    def _on_preview_ready(self, task, jpg_path):
+        if task is not self._preview_task:
+            return
         if jpg_path:
             pix = QPixmap(jpg_path)
             if not pix.isNull():
-                self.preview_label.setPixmap(
-                    pix.scaled(self.preview_label.width(), 220, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                )
+                # ffmpeg already scaled it; this only covers a label resized since
+                dpr = self.preview_label.devicePixelRatioF()
+                pix = pix.scaled(round(self.preview_label.width() * dpr), round(220 * dpr),
+                                 Qt.KeepAspectRatio, Qt.FastTransformation)
+                pix.setDevicePixelRatio(dpr)
+                self.preview_label.setPixmap(pix)
                 return
         self.preview_label.setText("Preview unavailable")
 
-    # ----- Queue conversion (one-by-one) -----
+    def closeEvent(self, e):
+        # drop queued encodes and stop running ones, so the pools' destructors
+        # don't keep converting with no window left
+        self.encode_pool.clear()
+        for worker in list(self.active):
+            worker.cancel()
+        if self._preview_task is not None:
+            self._preview_task.cancel()
+        super().closeEvent(e)
+
+    def _on_encoder_detected(self, encoder):
+        self.encoder = encoder
+        if encoder != "libx264":
+            self.encode_pool.setMaxThreadCount(min(MAX_CONCURRENT, HW_MAX_CONCURRENT))
+        self._detector = None
+
+    # ----- Queue conversion (encode pool) -----
     def start_queue(self):
         if not self.files or not self.output_dir:
             QMessageBox.warning(self, "Missing info", "Add files + select output folder")
             return
 
-        self.queue = list(self.files)
+        self.active = set()
+        self.file_progress = {f: 0 for f in self.files}
+        self.errors = []
         self.progress.setValue(0)
         self.done_count = 0
-        self.status.setText("Processing…")
         self.btn_start.setEnabled(False)
         self.btn_add.setEnabled(False)
         self.btn_remove.setEnabled(False)
         self.btn_output.setEnabled(False)
 
-        self._run_next()
+        sat = self.s_slider.value() / 100.0
+        # split the cores evenly between the encoders that run side by side
+        threads = max(1, (os.cpu_count() or 2) // MAX_CONCURRENT)
+        for f in self.files:
+            out = str(Path(self.output_dir) / (Path(f).stem + "_converted.mp4"))
 
-    def _run_next(self):
-        if not self.queue:
-            self.btn_start.setEnabled(True)
-            self.btn_add.setEnabled(True)
-            self.btn_remove.setEnabled(True)
-            self.btn_output.setEnabled(True)
-            self.status.setText("Completed")
-            QMessageBox.information(self, "Done", "✅ All files converted.")
-            return
+            worker = FFmpegWorker(f, out, sat, threads, self.encoder)
+            self.active.add(worker)  # keep reference
 
-        f = self.queue.pop(0)
-        out = str(Path(self.output_dir) / (Path(f).stem + "_converted.mp4"))
-        sat = self.s_slider.value() / 100.0
+            worker.signals.progress.connect(lambda pct, f=f: self._worker_progress(f, pct))
+            worker.signals.done.connect(lambda _out, w=worker: self._worker_done(w))
+            worker.signals.error.connect(lambda msg, w=worker: self._worker_error(w, msg))
+            self.encode_pool.start(worker)  # queues beyond MAX_CONCURRENT
 
-        worker = FFmpegWorker(f, out, sat)
-        self.workers.append(worker)  # keep reference
-        self.current_worker = worker
+        self._update_queue_status()
+
+    def _update_queue_status(self):
+        if self.active:
+            total = len(self.file_progress)
+            self.status.setText(f"Processing… ({total - len(self.active)}/{total} done)")
+            return
+
+        self.btn_start.setEnabled(True)
+        self.btn_add.setEnabled(True)
+        self.btn_remove.setEnabled(True)
+        self.btn_output.setEnabled(True)
+        self.status.setText("Completed")
+        if self.errors:
+            QMessageBox.critical(self, "Error", "\n".join(self.errors))
+        else:
+            QMessageBox.information(self, "Done", "✅ All files converted.")
 
-        worker.progress.connect(self.progress.setValue)
-        worker.done.connect(self._worker_done)
-        worker.error.connect(self._worker_error)
-        worker.start()
-        self.status.setText(f"Processing: {Path(f).name}")
+    def _worker_progress(self, f, pct):
+        self.file_progress[f] = pct
+        self.progress.setValue(sum(self.file_progress.values()) // len(self.file_progress))
 
-    def _worker_done(self, _out):
+    def _worker_done(self, worker):
         self.done_count += 1
-        self._run_next()
+        self._worker_progress(worker.input_path, 100)
+        self.active.discard(worker)
+        self._update_queue_status()
 
-    def _worker_error(self, msg):
-        QMessageBox.critical(self, "Error", msg)
-        # continue with next file
-        self._run_next()
+    def _worker_error(self, worker, msg):
+        # keep going with the rest; report once at the end
+        self.errors.append(f"{Path(worker.input_path).name}: {msg}")
+        self._worker_progress(worker.input_path, 100)
+        self.active.discard(worker)
+        self._update_queue_status()
 
 def main():
     app = QApplication(sys.argv)
     w = App()
     w.show()
-    sys.exit(app.exec_())
+    ret = app.exec_()
+    prune_previews()
+    sys.exit(ret)
 
 if __name__ == "__main__":
     main()